@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+🚦 ORPHEUS SYNTHESIS SCHEDULER
+==============================
+Keeps live interactive speech ahead of background rendering
+Interactive jobs dispatch first; jobs pause/cancel at chunk boundaries
+Bulk gets a reserved share of upstream concurrency so it never starves
+==============================
+"""
+
+import time
+import asyncio
+import threading
+from collections import deque
+
+INTERACTIVE = 'interactive'
+BULK = 'bulk'
+PRIORITIES = (INTERACTIVE, BULK)
+
+
+class JobCancelled(Exception):
+    """Raised at a chunk boundary when a running job has been cancelled"""
+
+
+class SchedulerStats:
+    """Per-class counters - queue wait is measured submit -> dispatch"""
+
+    __slots__ = ('submitted', 'dispatched', 'completed', 'cancelled', 'failed',
+                 'wait_total', 'wait_max')
+
+    def __init__(self):
+        self.submitted = 0
+        self.dispatched = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.failed = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_wait(self, wait):
+        self.dispatched += 1
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+
+    def as_dict(self):
+        """Stats as a plain dictionary, including mean wait"""
+        summary = {slot: getattr(self, slot) for slot in self.__slots__}
+        summary['wait_mean'] = self.wait_total / self.dispatched if self.dispatched else 0.0
+        return summary
+
+
+class SynthesisJob:
+    """One queued synthesis request"""
+
+    __slots__ = ('text', 'voice', 'priority', 'future', 'enqueued_at',
+                 'dispatched', 'cancelled', 'paused', '_wake', '_on_cancel')
+
+    def __init__(self, text, voice, priority, future, enqueued_at, on_cancel=None):
+        self.text = text
+        self.voice = voice
+        self.priority = priority
+        self.future = future
+        self.enqueued_at = enqueued_at
+        self.dispatched = False
+        self.cancelled = False
+        self.paused = False
+        self._wake = asyncio.Event()
+        self._on_cancel = on_cancel
+
+    def pause(self):
+        """Hold the job at its next chunk boundary"""
+        self.paused = True
+
+    def resume(self):
+        """Let a paused job continue"""
+        self.paused = False
+        self._wake.set()
+
+    def cancel(self):
+        """Cancel the job - queued jobs are dropped, running ones stop at the next chunk
+
+        Returns False if the job had already finished.
+        """
+        if self.future.done():
+            return False
+        self._mark_cancelled()
+        if self._on_cancel is not None:
+            self._on_cancel()
+        return True
+
+    def _mark_cancelled(self):
+        self.cancelled = True
+        self._wake.set()
+        if not self.dispatched:
+            self.future.cancel()
+
+    def __await__(self):
+        return self.future.__await__()
+
+
+class SynthesisScheduler:
+    """Two-class scheduler in front of one Orpheus engine"""
+
+    def __init__(self, engine, max_concurrency=4, bulk_share=0.25, clock=time.perf_counter):
+        if max_concurrency < 2:
+            raise ValueError("max_concurrency must be at least 2 to separate classes")
+        if not 0.0 < bulk_share < 1.0:
+            raise ValueError("bulk_share must be between 0 and 1")
+
+        self.engine = engine
+        self.max_concurrency = max_concurrency
+        # Slots bulk may occupy; interactive may borrow them while bulk is idle
+        self.bulk_slots = min(max_concurrency - 1, max(1, round(max_concurrency * bulk_share)))
+        self.clock = clock
+
+        self.queues = {priority: deque() for priority in PRIORITIES}
+        self.running = {priority: 0 for priority in PRIORITIES}
+        self.stats = {priority: SchedulerStats() for priority in PRIORITIES}
+        self.bulk_jobs = set()
+        self._tasks = set()
+        self.bulk_paused = False
+
+    def submit(self, text, voice=None, priority=INTERACTIVE):
+        """Queue a job and return it - await the job for (audio, timing)"""
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority '{priority}'")
+
+        loop = asyncio.get_running_loop()
+        job = SynthesisJob(text, voice, priority, loop.create_future(), self.clock(),
+                           on_cancel=self._purge_cancelled)
+        self.queues[priority].append(job)
+        self.stats[priority].submitted += 1
+        if priority == BULK:
+            self.bulk_jobs.add(job)
+        self._dispatch()
+        return job
+
+    async def speak(self, text, voice=None, priority=INTERACTIVE):
+        """Submit and wait - returns (audio, timing)"""
+        return await self.submit(text, voice, priority)
+
+    def prerender(self, phrases, voice=None):
+        """Queue phrases as bulk jobs to warm the engine's clip cache"""
+        return [self.submit(phrase, voice, BULK) for phrase in phrases]
+
+    def pause_bulk(self):
+        """Hold every bulk job - running ones stop at their next chunk"""
+        self.bulk_paused = True
+
+    def resume_bulk(self):
+        """Release paused bulk work"""
+        self.bulk_paused = False
+        for job in self.bulk_jobs:
+            job._wake.set()
+        self._dispatch()
+
+    def cancel_bulk(self):
+        """Cancel all queued and running bulk jobs - returns how many
+
+        A pause set with pause_bulk() stays in effect for later bulk jobs.
+        """
+        jobs = [job for job in self.bulk_jobs if not job.cancelled and not job.future.done()]
+        for job in jobs:
+            job._mark_cancelled()
+        self._purge_cancelled()
+        return len(jobs)
+
+    def queue_wait_stats(self):
+        """Queue-wait and outcome stats per priority class"""
+        return {priority: self.stats[priority].as_dict() for priority in PRIORITIES}
+
+    def _dispatch(self):
+        """Start as many queued jobs as the concurrency budget allows"""
+        while sum(self.running.values()) < self.max_concurrency:
+            priority = self._next_priority()
+            if priority is None:
+                return
+            job = self.queues[priority].popleft()
+            if job.cancelled:
+                self._finish_cancelled(job)
+                continue
+            job.dispatched = True
+            self.running[priority] += 1
+            self.stats[priority].record_wait(self.clock() - job.enqueued_at)
+            task = asyncio.get_running_loop().create_task(self._run(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _next_priority(self):
+        """Interactive first, unless bulk is below its reserved share"""
+        interactive_waiting = bool(self.queues[INTERACTIVE])
+        bulk_ready = (
+            bool(self.queues[BULK])
+            and not self.bulk_paused
+            and self.running[BULK] < self.bulk_slots
+        )
+        interactive_share = self.max_concurrency - self.bulk_slots
+
+        if interactive_waiting and (not bulk_ready or self.running[INTERACTIVE] < interactive_share):
+            return INTERACTIVE
+        if bulk_ready:
+            return BULK
+        return None
+
+    async def _run(self, job):
+        """Run one job against the engine and settle its future"""
+        try:
+            result = await self.engine.orpheus_speak_timed_async(
+                job.text, job.voice, checkpoint=self._checkpoint(job)
+            )
+        except JobCancelled:
+            self._finish_cancelled(job)
+        except asyncio.CancelledError:
+            # Task torn down (e.g. loop shutdown) - settle, but start nothing new
+            self.running[job.priority] -= 1
+            self._finish_cancelled(job)
+            raise
+        except Exception as e:
+            self.stats[job.priority].failed += 1
+            if not job.future.done():
+                job.future.set_exception(e)
+        else:
+            # Cancelled after its last checkpoint (or served from cache) - still cancelled
+            if job.cancelled:
+                self._finish_cancelled(job)
+            else:
+                self.stats[job.priority].completed += 1
+                if not job.future.done():
+                    job.future.set_result(result)
+
+        self.running[job.priority] -= 1
+        self.bulk_jobs.discard(job)
+        self._dispatch()
+
+    def _checkpoint(self, job):
+        """Chunk-boundary hook: wait while paused, stop if cancelled"""
+        async def checkpoint():
+            while not job.cancelled and (
+                job.paused or (job.priority == BULK and self.bulk_paused)
+            ):
+                job._wake.clear()
+                await job._wake.wait()
+            if job.cancelled:
+                raise JobCancelled()
+        return checkpoint
+
+    def _purge_cancelled(self):
+        """Drop cancelled jobs from the queues right away"""
+        for priority, queue in self.queues.items():
+            cancelled = [job for job in queue if job.cancelled]
+            if not cancelled:
+                continue
+            self.queues[priority] = deque(job for job in queue if not job.cancelled)
+            for job in cancelled:
+                self._finish_cancelled(job)
+        self._dispatch()
+
+    def _finish_cancelled(self, job):
+        self.stats[job.priority].cancelled += 1
+        self.bulk_jobs.discard(job)
+        if not job.future.done():
+            job.future.cancel()
+
+
+class SchedulerThread:
+    """SynthesisScheduler on its own long-lived event loop thread
+
+    Blocking callers (interactive_mode, demos, the voice-input worker) share
+    one scheduler through this instead of one asyncio.run() per utterance.
+    """
+
+    def __init__(self, engine, max_concurrency=4, bulk_share=0.25):
+        self.scheduler = SynthesisScheduler(engine, max_concurrency, bulk_share)
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="orpheus-scheduler",
+                                        daemon=True)
+        self._thread.start()
+
+    def submit(self, text, voice=None, priority=INTERACTIVE):
+        """Queue a job from any thread - returns a concurrent.futures.Future"""
+        return asyncio.run_coroutine_threadsafe(
+            self.scheduler.speak(text, voice, priority), self.loop
+        )
+
+    def speak(self, text, voice=None, priority=INTERACTIVE):
+        """Blocking synthesis - returns (audio, timing)"""
+        return self.submit(text, voice, priority).result()
+
+    def prerender(self, phrases, voice=None):
+        """Queue phrases as bulk jobs without waiting - returns futures"""
+        return [self.submit(phrase, voice, BULK) for phrase in phrases]
+
+    def pause_bulk(self):
+        self._call(self.scheduler.pause_bulk)
+
+    def resume_bulk(self):
+        self._call(self.scheduler.resume_bulk)
+
+    def cancel_bulk(self):
+        return self._call(self.scheduler.cancel_bulk)
+
+    def queue_wait_stats(self):
+        return self._call(self.scheduler.queue_wait_stats)
+
+    def close(self):
+        """Cancel bulk work, stop the loop and join the thread"""
+        if not self.loop.is_running():
+            return
+        self.cancel_bulk()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+
+    def _call(self, fn):
+        """Run a scheduler method on the loop thread and return its result"""
+        async def call():
+            return fn()
+        return asyncio.run_coroutine_threadsafe(call(), self.loop).result()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+🎭 ORPHEUS SESSION MANAGER
+==========================
+Multi-tenant sessions on top of ONE shared Orpheus engine
+Each caller keeps only compact state: voice, emotion, queue, stats
+Idle sessions expire automatically
+==========================
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+import tracemalloc
+from collections import deque
+from pathlib import Path
+
+# Import the working Orpheus
+sys.path.append(str(Path(__file__).parent))
+
+from real_working_orpheus_edge import ORPHEUS_VOICES, ORPHEUS_EMOTIONS
+
+
+class SessionStats:
+    """Per-session counters"""
+
+    __slots__ = ('requests', 'failures', 'audio_bytes', 'synth_seconds')
+
+    def __init__(self):
+        self.requests = 0
+        self.failures = 0
+        self.audio_bytes = 0
+        self.synth_seconds = 0.0
+
+    def as_dict(self):
+        """Stats as a plain dictionary"""
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+class OrpheusSession:
+    """Compact state for one caller - no engine, no voice table"""
+
+    __slots__ = ('session_id', 'voice', 'default_emotion', 'queue', 'stats', 'last_active',
+                 'in_flight')
+
+    def __init__(self, session_id, voice='aria', default_emotion=None, now=0.0):
+        self.session_id = session_id
+        self.voice = voice
+        self.default_emotion = default_emotion
+        self.queue = deque()
+        self.stats = SessionStats()
+        self.last_active = now
+        self.in_flight = 0
+
+    def apply_default_emotion(self, text):
+        """Add the session's default emotion tag unless the text has its own"""
+        if not self.default_emotion:
+            return text
+        if any(tag in text for tag in ORPHEUS_EMOTIONS):
+            return text
+        return f"{self.default_emotion} {text}"
+
+
+class OrpheusSessionManager:
+    """Many sessions, one synthesis engine"""
+
+    def __init__(self, engine=None, idle_timeout=300.0, max_concurrency=8,
+                 sweep_interval=30.0, clock=time.monotonic):
+        if engine is None:
+            from real_working_orpheus_edge import RealWorkingOrpheus
+            engine = RealWorkingOrpheus(init_audio=False)
+
+        self.engine = engine
+        self.idle_timeout = idle_timeout
+        self.sweep_interval = sweep_interval
+        self.clock = clock
+        self.sessions = {}
+        self.max_concurrency = max_concurrency
+        self._upstream = None
+        self._upstream_loop = None
+        self._next_id = 0
+        self._last_sweep = clock()
+
+    def create_session(self, voice='aria', default_emotion=None, session_id=None):
+        """Create a new session and return it"""
+        if voice not in ORPHEUS_VOICES:
+            raise ValueError(f"Voice '{voice}' not available")
+        if default_emotion is not None:
+            default_emotion = self._normalize_emotion(default_emotion)
+
+        now = self.clock()
+        self._maybe_sweep(now)
+
+        if session_id is None:
+            self._next_id += 1
+            session_id = f"s{self._next_id}"
+        elif session_id in self.sessions:
+            raise ValueError(f"Session '{session_id}' already exists")
+
+        session = OrpheusSession(session_id, voice, default_emotion, now)
+        self.sessions[session_id] = session
+        return session
+
+    def get_session(self, session_id):
+        """Look up a live session and mark it active"""
+        now = self.clock()
+        self._maybe_sweep(now)
+
+        session = self.sessions.get(session_id)
+        if session is not None and self._is_idle(session, now - self.idle_timeout):
+            del self.sessions[session_id]
+            session = None
+        if session is None:
+            raise KeyError(f"Session '{session_id}' not found or expired")
+        session.last_active = now
+        return session
+
+    def close_session(self, session_id):
+        """Drop a session explicitly"""
+        return self.sessions.pop(session_id, None) is not None
+
+    def set_voice(self, session_id, voice_name):
+        """Change one session's voice without touching the engine"""
+        if voice_name not in ORPHEUS_VOICES:
+            return False
+        self.get_session(session_id).voice = voice_name
+        return True
+
+    def set_default_emotion(self, session_id, emotion):
+        """Change one session's default emotion (None clears it)"""
+        session = self.get_session(session_id)
+        session.default_emotion = self._normalize_emotion(emotion) if emotion else None
+
+    def expire_idle(self, now=None):
+        """Remove sessions idle longer than the timeout - returns count"""
+        if now is None:
+            now = self.clock()
+        cutoff = now - self.idle_timeout
+        expired = [
+            session_id for session_id, session in self.sessions.items()
+            if self._is_idle(session, cutoff)
+        ]
+        for session_id in expired:
+            del self.sessions[session_id]
+        self._last_sweep = now
+        return len(expired)
+
+    async def run_expiry(self):
+        """Periodic sweep task - run with asyncio.create_task() on the serving loop"""
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            self.expire_idle()
+
+    def submit(self, session_id, text):
+        """Queue text for a session - returns the queue length"""
+        session = self.get_session(session_id)
+        session.queue.append(text)
+        return len(session.queue)
+
+    async def speak(self, session_id, text):
+        """Synthesize one utterance for a session through the shared engine"""
+        session = self.get_session(session_id)
+        return await self._synthesize(session, text)
+
+    async def drain_session(self, session_id):
+        """Synthesize everything queued for a session, in order"""
+        session = self.get_session(session_id)
+        clips = []
+        while session.queue:
+            clips.append(await self._synthesize(session, session.queue.popleft()))
+        return clips
+
+    async def drain_all(self):
+        """Drain every session concurrently - returns {session_id: clips}"""
+        session_ids = [sid for sid, session in self.sessions.items() if session.queue]
+        results = await asyncio.gather(*(self.drain_session(sid) for sid in session_ids))
+        return dict(zip(session_ids, results))
+
+    def stats(self):
+        """Aggregate stats across live sessions"""
+        totals = SessionStats()
+        queued = 0
+        for session in self.sessions.values():
+            queued += len(session.queue)
+            for slot in SessionStats.__slots__:
+                setattr(totals, slot, getattr(totals, slot) + getattr(session.stats, slot))
+        summary = totals.as_dict()
+        summary['sessions'] = len(self.sessions)
+        summary['queued'] = queued
+        return summary
+
+    async def _synthesize(self, session, text):
+        """Run one request against the engine under the upstream limit"""
+        text = session.apply_default_emotion(text)
+        session.stats.requests += 1
+        # Counts waiting on the semaphore too, so busy sessions never look idle
+        session.in_flight += 1
+        start = time.perf_counter()
+        try:
+            async with self._upstream_limit():
+                audio_data = await self.engine.orpheus_speak_async(text, session.voice)
+        except Exception:
+            session.stats.failures += 1
+            raise
+        finally:
+            session.in_flight -= 1
+            session.stats.synth_seconds += time.perf_counter() - start
+            session.last_active = self.clock()
+
+        session.stats.audio_bytes += len(audio_data)
+        return audio_data
+
+    def _upstream_limit(self):
+        """Semaphore bound to the running loop - recreated when the loop changes"""
+        loop = asyncio.get_running_loop()
+        if self._upstream_loop is not loop:
+            self._upstream = asyncio.Semaphore(self.max_concurrency)
+            self._upstream_loop = loop
+        return self._upstream
+
+    @staticmethod
+    def _is_idle(session, cutoff):
+        """Idle past the cutoff with nothing queued or in flight"""
+        return session.last_active < cutoff and not session.queue and not session.in_flight
+
+    def _maybe_sweep(self, now):
+        """Expire idle sessions at most once per sweep interval"""
+        if now - self._last_sweep >= self.sweep_interval:
+            self.expire_idle(now)
+
+    @staticmethod
+    def _normalize_emotion(emotion):
+        """Accept 'laugh' or '<laugh>' and return the tag form"""
+        tag = emotion if emotion.startswith('<') else f"<{emotion}>"
+        if tag not in ORPHEUS_EMOTIONS:
+            raise ValueError(f"Emotion '{emotion}' not available")
+        return tag
+
+
+class _OfflineEngine:
+    """Stand-in engine for load testing the session layer without network"""
+
+    def __init__(self, synth_delay=0.005, clip_bytes=4096):
+        self.synth_delay = synth_delay
+        self.clip = b"\x00" * clip_bytes
+
+    async def orpheus_speak_async(self, text_with_emotions, voice_name=None):
+        await asyncio.sleep(self.synth_delay)
+        return self.clip
+
+
+async def _load_test_round(engine, session_count, requests_per_session, max_concurrency):
+    """Create sessions, queue work, drain, and measure"""
+    tracemalloc.start()
+    baseline = tracemalloc.take_snapshot()
+
+    manager = OrpheusSessionManager(engine, max_concurrency=max_concurrency)
+    voices = list(ORPHEUS_VOICES)
+    emotions = [None] + list(ORPHEUS_EMOTIONS)
+    for i in range(session_count):
+        manager.create_session(voices[i % len(voices)], emotions[i % len(emotions)])
+
+    sessions_memory = sum(
+        stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(baseline, 'filename')
+    )
+    tracemalloc.stop()
+
+    for session_id in list(manager.sessions):
+        for n in range(requests_per_session):
+            manager.submit(session_id, f"Hello caller {session_id}, message {n}")
+
+    start = time.perf_counter()
+    await manager.drain_all()
+    elapsed = time.perf_counter() - start
+
+    total = manager.stats()['requests']
+    return {
+        'sessions': session_count,
+        'bytes_per_session': sessions_memory / session_count,
+        'requests': total,
+        'seconds': elapsed,
+        'throughput': total / elapsed if elapsed else 0.0,
+    }
+
+
+def run_load_test(session_counts=(100, 1000, 5000), requests_per_session=2,
+                  max_concurrency=64, live=False):
+    """Show how memory per session and throughput scale"""
+    print("🧪 ORPHEUS SESSION LOAD TEST")
+    print("=" * 60)
+    print(f"🎪 Engine: {'Edge TTS (live)' if live else 'offline stand-in'}")
+    print(f"🔀 Upstream concurrency: {max_concurrency}")
+    print("=" * 60)
+    print(f"{'sessions':>10} {'bytes/session':>15} {'requests':>10} {'seconds':>10} {'req/s':>10}")
+
+    if live:
+        from real_working_orpheus_edge import RealWorkingOrpheus
+        engine = RealWorkingOrpheus(init_audio=False)
+    else:
+        engine = _OfflineEngine()
+
+    results = []
+    for session_count in session_counts:
+        result = asyncio.run(
+            _load_test_round(engine, session_count, requests_per_session, max_concurrency)
+        )
+        results.append(result)
+        print(f"{result['sessions']:>10} {result['bytes_per_session']:>15.0f} "
+              f"{result['requests']:>10} {result['seconds']:>10.2f} {result['throughput']:>10.0f}")
+
+    return results
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Orpheus session manager load test")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[100, 1000, 5000])
+    parser.add_argument('--requests', type=int, default=2, help="requests per session")
+    parser.add_argument('--concurrency', type=int, default=64, help="upstream concurrency")
+    parser.add_argument('--live', action='store_true', help="use real Edge TTS")
+    args = parser.parse_args()
+
+    try:
+        run_load_test(args.sessions, args.requests, args.concurrency, args.live)
+    except Exception as e:
+        print(f"❌ Load test failed: {e}")
+
+
+if __name__ == "__main__":
+    main()
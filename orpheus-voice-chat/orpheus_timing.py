@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+⏱️ ORPHEUS WORD TIMING INDEX
+============================
+Compact word-boundary index built from Edge TTS WordBoundary events
+Used for live captions, lip-sync and mid-sentence barge-in
+============================
+"""
+
+from array import array
+from bisect import bisect_right
+
+# Edge TTS reports offsets and durations in 100-nanosecond ticks
+TICKS_PER_MS = 10_000
+
+
+class WordTimingIndex:
+    """Array-backed (word, offset, duration) index - all times in milliseconds"""
+
+    __slots__ = ('_text', '_starts', '_offsets', '_durations')
+
+    def __init__(self):
+        self._text = []               # words while building, one str once frozen
+        self._starts = array('I')     # start of each word inside the frozen text
+        self._offsets = array('I')    # word start, ms from beginning of clip
+        self._durations = array('I')  # word duration, ms
+
+    @property
+    def frozen(self):
+        """True once freeze() has packed the index"""
+        return isinstance(self._text, str)
+
+    @property
+    def offsets(self):
+        """Read-only view of word start times (ms)"""
+        return memoryview(self._offsets).toreadonly()
+
+    @property
+    def durations(self):
+        """Read-only view of word durations (ms)"""
+        return memoryview(self._durations).toreadonly()
+
+    def add_boundary(self, chunk):
+        """Record one Edge TTS WordBoundary chunk"""
+        if self.frozen:
+            raise RuntimeError("WordTimingIndex is frozen - it may be shared from the clip cache")
+        self._text.append(chunk["text"])
+        self._offsets.append(chunk["offset"] // TICKS_PER_MS)
+        self._durations.append(chunk["duration"] // TICKS_PER_MS)
+
+    def freeze(self):
+        """Pack collected words into a single string - returns self"""
+        if not self.frozen:
+            position = 0
+            for word in self._text:
+                self._starts.append(position)
+                position += len(word)
+            self._text = "".join(self._text)
+        return self
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __iter__(self):
+        for i in range(len(self._offsets)):
+            yield self.word(i), self._offsets[i], self._durations[i]
+
+    def word(self, i):
+        """The i-th word"""
+        if not self.frozen:
+            return self._text[i]
+        end = self._starts[i + 1] if i + 1 < len(self._starts) else len(self._text)
+        return self._text[self._starts[i]:end]
+
+    def word_at(self, position_ms):
+        """Index of the word being spoken at a playback position, or -1 before the first"""
+        return bisect_right(self._offsets, position_ms) - 1
+
+    def spoken_text(self, position_ms):
+        """Words started by a playback position - for captions and barge-in"""
+        count = self.word_at(position_ms) + 1
+        return " ".join(self.word(i) for i in range(count))
+
+    def end_ms(self):
+        """End of the last word in milliseconds"""
+        if not self._offsets:
+            return 0
+        return self._offsets[-1] + self._durations[-1]
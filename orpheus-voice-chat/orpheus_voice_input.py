@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+🎙️ ORPHEUS VOICE INPUT
+======================
+Offline voice-in loop: microphone or WAV files -> energy VAD -> recognizer
+Vectorized energy / zero-crossing endpointing with low latency
+Pauses Orpheus playback as soon as the user starts talking
+Measures turn-taking latency: end of speech -> start of reply
+======================
+"""
+
+import sys
+import time
+import wave
+import queue
+import threading
+import argparse
+import numpy as np
+from collections import deque
+from pathlib import Path
+
+# Import the working Orpheus
+sys.path.append(str(Path(__file__).parent))
+
+SAMPLE_RATE = 16000
+FRAME_MS = 20
+
+
+class WavFrameSource:
+    """16-bit mono PCM frames from WAV files - for testing without a microphone"""
+
+    def __init__(self, paths, frame_ms=FRAME_MS, realtime=True, trailing_silence_ms=1000):
+        self.paths = [Path(p) for p in paths]
+        self.frame_ms = frame_ms
+        self.realtime = realtime
+        self.trailing_silence_ms = trailing_silence_ms
+        self.sample_rate = None
+
+    def frames(self):
+        """Yield int16 frames, paced like a live microphone when realtime is set"""
+        for path in self.paths:
+            with wave.open(str(path), 'rb') as wav:
+                if wav.getsampwidth() != 2 or wav.getnchannels() != 1:
+                    raise ValueError(f"{path.name}: expected 16-bit mono PCM")
+                if self.sample_rate is None:
+                    self.sample_rate = wav.getframerate()
+                elif wav.getframerate() != self.sample_rate:
+                    raise ValueError(f"{path.name}: sample rate differs from {self.sample_rate} Hz")
+                samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+
+            frame_len = self.sample_rate * self.frame_ms // 1000
+            # Pad with silence so the final utterance can be endpointed
+            silence = np.zeros(self.sample_rate * self.trailing_silence_ms // 1000, dtype=np.int16)
+            samples = np.concatenate([samples, silence])
+            usable = len(samples) // frame_len * frame_len
+
+            for frame in samples[:usable].reshape(-1, frame_len):
+                if self.realtime:
+                    time.sleep(self.frame_ms / 1000)
+                yield frame
+
+
+class MicrophoneFrameSource:
+    """16-bit mono PCM frames from the default microphone via pyaudio"""
+
+    def __init__(self, sample_rate=SAMPLE_RATE, frame_ms=FRAME_MS):
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+
+    def frames(self):
+        """Yield int16 frames until the stream is closed"""
+        try:
+            import pyaudio
+        except ImportError:
+            raise RuntimeError("pyaudio is not installed - use --wav files instead")
+
+        frame_len = self.sample_rate * self.frame_ms // 1000
+        audio = pyaudio.PyAudio()
+        stream = audio.open(format=pyaudio.paInt16, channels=1, rate=self.sample_rate,
+                            input=True, frames_per_buffer=frame_len)
+        try:
+            while True:
+                data = stream.read(frame_len, exception_on_overflow=False)
+                yield np.frombuffer(data, dtype=np.int16)
+        finally:
+            stream.stop_stream()
+            stream.close()
+            audio.terminate()
+
+
+class EnergyVAD:
+    """Energy + zero-crossing voice activity detector with endpointing
+
+    The noise floor starts as a low percentile of the calibration window.
+    After that it drops at once to quieter frames but only creeps upwards,
+    and more slowly still during an utterance, so speech never becomes the
+    floor. If the floor falls well below the calibration estimate before any
+    speech was found, the calibration window was itself speech: the frames
+    seen so far are re-checked and their events come back with earlier (for
+    a single-frame block, negative) indices.
+    """
+
+    def __init__(self, frame_ms=FRAME_MS, threshold_db=12.0, zcr_threshold=0.25,
+                 min_speech_ms=60, hangover_ms=300, calibration_ms=200, floor_percentile=10,
+                 floor_fall=0.5, floor_rise_db_per_s=1.0, speech_floor_rise_db_per_s=0.5,
+                 lookback_ms=5000, floor_min_db=-90.0):
+        self.frame_ms = frame_ms
+        self.threshold_db = threshold_db
+        self.zcr_threshold = zcr_threshold
+        self.start_frames = max(1, min_speech_ms // frame_ms)
+        self.end_frames = max(1, hangover_ms // frame_ms)
+        self.calibration_frames = max(1, calibration_ms // frame_ms)
+        self.floor_percentile = floor_percentile
+        self.floor_fall = floor_fall
+        self.floor_rise = floor_rise_db_per_s * frame_ms / 1000
+        # A slow creep during speech still lets a lasting jump in background noise end the utterance
+        self.speech_floor_rise = speech_floor_rise_db_per_s * frame_ms / 1000
+        self.lookback = max(self.calibration_frames, lookback_ms // frame_ms)
+        self.floor_min_db = floor_min_db
+        self.reset()
+
+    def reset(self):
+        """Forget the current utterance and noise estimate"""
+        self.noise_floor_db = float('nan')
+        self.in_speech = False
+        self.last_voiced = False
+        self._energies = deque(maxlen=self.lookback)
+        self._zcrs = deque(maxlen=self.lookback)
+        self._calibrated_floor = float('nan')
+        self._frames_seen = 0
+        self._speech_seen = False
+        self._voiced_run = 0
+        self._silent_run = 0
+
+    @staticmethod
+    def features(frames):
+        """Per-frame energy (dBFS) and zero-crossing rate for a (n, frame_len) int16 block"""
+        x = np.asarray(frames, dtype=np.float32) / 32768.0
+        if x.ndim == 1:
+            x = x[np.newaxis, :]
+        rms = np.sqrt(np.mean(x * x, axis=1))
+        energy_db = 20.0 * np.log10(rms + 1e-10)
+        signs = np.signbit(x)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (x.shape[1] - 1)
+        return energy_db, zcr
+
+    def classify(self, energy_db, zcr, floor):
+        """Voiced flags - loud frames, or quieter fricative-like ones"""
+        above = energy_db - floor
+        return (above > self.threshold_db) | (
+            (above > self.threshold_db / 2) & (zcr > self.zcr_threshold)
+        )
+
+    def process(self, frames):
+        """Feed a block of frames - returns [(frame_index, 'start' | 'end'), ...]"""
+        energy_db, zcr = self.features(frames)
+        events = []
+        voiced = False
+        for i, (energy, crossings) in enumerate(zip(energy_db.tolist(), zcr.tolist())):
+            self._energies.append(energy)
+            self._zcrs.append(crossings)
+            self._frames_seen += 1
+
+            # Decisions wait for the calibration window, then cover it too
+            if self._frames_seen <= self.calibration_frames:
+                if self._frames_seen == self.calibration_frames:
+                    floor = float(np.percentile(self._energies, self.floor_percentile))
+                    self._calibrated_floor = self.noise_floor_db = max(floor, self.floor_min_db)
+                    events += self._replay(i + 1, len(self._energies))
+                    voiced = self._voiced_run > 0
+                continue
+
+            self._track_floor(energy)
+            if (not self._speech_seen and self._frames_seen <= self.lookback
+                    and self._calibrated_floor - self.noise_floor_db > self.threshold_db):
+                self._speech_seen = True  # only ever once
+                events += self._replay(i, len(self._energies) - 1)
+            voiced = bool(self.classify(energy, crossings, self.noise_floor_db))
+            events += self._step(i, voiced)
+
+        self.last_voiced = voiced
+        return events
+
+    def _track_floor(self, energy):
+        """Fall straight to quieter frames, rise by at most a capped step"""
+        floor = self.noise_floor_db
+        if energy < floor:
+            floor += self.floor_fall * (energy - floor)
+        else:
+            floor += min(energy - floor, self.speech_floor_rise if self.in_speech else self.floor_rise)
+        self.noise_floor_db = max(floor, self.floor_min_db)
+
+    def _replay(self, stop, count):
+        """Re-run endpointing over the count buffered frames ending before block index stop"""
+        energies = np.array(self._energies)[:count]
+        zcrs = np.array(self._zcrs)[:count]
+        self._voiced_run = self._silent_run = 0
+        events = []
+        for offset, is_voiced in enumerate(self.classify(energies, zcrs, self.noise_floor_db)):
+            events += self._step(stop - count + offset, bool(is_voiced))
+        return events
+
+    def _step(self, index, voiced):
+        """Advance the start / end state machine by one frame"""
+        if voiced:
+            self._voiced_run += 1
+            self._silent_run = 0
+        else:
+            self._silent_run += 1
+            self._voiced_run = 0
+
+        if not self.in_speech and self._voiced_run >= self.start_frames:
+            self.in_speech = True
+            self._speech_seen = True
+            return [(index, 'start')]
+        if self.in_speech and self._silent_run >= self.end_frames:
+            self.in_speech = False
+            return [(index, 'end')]
+        return []
+
+    def detect_utterances(self, samples, frame_len):
+        """Offline helper: (start_frame, end_frame) pairs for a whole recording"""
+        self.reset()
+        usable = len(samples) // frame_len * frame_len
+        frames = np.asarray(samples[:usable]).reshape(-1, frame_len)
+        utterances = []
+        start = None
+        for i, event in self.process(frames):
+            if event == 'start':
+                start = i - self.start_frames + 1
+            else:
+                utterances.append((start, i - self.end_frames + 1))
+        return utterances
+
+
+class LocalStandInRecognizer:
+    """Offline stand-in recognizer - scripted transcripts, else a duration placeholder
+
+    Without a script, utterances shorter than min_utterance_ms (pre-roll
+    included) come back empty, so coughs and clicks act as false starts.
+    """
+
+    def __init__(self, transcripts=None, min_utterance_ms=500):
+        self.transcripts = list(transcripts or [])
+        self.min_utterance_ms = min_utterance_ms
+
+    def __call__(self, pcm, sample_rate):
+        if self.transcripts:
+            return self.transcripts.pop(0)
+        seconds = len(pcm) / sample_rate
+        if seconds * 1000 < self.min_utterance_ms:
+            return ""
+        return f"[utterance {seconds:.1f}s]"
+
+
+class SpeechRecognitionRecognizer:
+    """Recognizer backed by the SpeechRecognition package (pocketsphinx is offline)"""
+
+    def __init__(self, method='recognize_sphinx'):
+        import speech_recognition as sr
+        self._sr = sr
+        self._recognizer = sr.Recognizer()
+        self._method = getattr(self._recognizer, method)
+
+    def __call__(self, pcm, sample_rate):
+        audio = self._sr.AudioData(pcm.tobytes(), sample_rate, 2)
+        try:
+            return self._method(audio)
+        except self._sr.UnknownValueError:
+            return ""
+
+
+class VoiceInputLoop:
+    """Listen, endpoint, recognize, reply - with barge-in and latency tracking
+
+    Recognition and synthesis run on a worker thread so the capture loop
+    keeps reading frames (and can detect barge-in) while a reply is prepared.
+    Playback calls and the shared barge-in state go through one lock.
+    """
+
+    def __init__(self, source, recognizer, respond=None, orpheus=None, vad=None, preroll_ms=200):
+        self.source = source
+        self.recognizer = recognizer
+        self.respond = respond or (lambda text: text)
+        self.orpheus = orpheus
+        self.vad = vad or EnergyVAD(frame_ms=source.frame_ms)
+        self.preroll_frames = max(1, preroll_ms // source.frame_ms)
+        self.turn_latencies = []
+        self.barge_ins = 0
+        self.reply_paused = False
+        self.user_speaking = False
+        self._lock = threading.Lock()
+        self._turns = queue.Queue()
+
+    def run(self, max_turns=None):
+        """Run until the source ends, max_turns replies, or Ctrl+C"""
+        print("🎙️ Listening... (Ctrl+C to stop)")
+        worker = threading.Thread(target=self._turn_worker, daemon=True)
+        worker.start()
+
+        # The VAD can report events for earlier frames, so keep its look-back window
+        recent = deque(maxlen=self.vad.lookback + self.preroll_frames)
+        arrivals = deque(maxlen=recent.maxlen)
+        utterance = None
+        turns = 0
+
+        try:
+            for frame in self.source.frames():
+                arrivals.append(time.perf_counter())
+                events = self.vad.process(frame)
+
+                recent.append(frame)
+                if utterance is not None:
+                    utterance.append(frame)
+
+                for index, event in events:
+                    frames_back = -index  # 0 is this frame
+                    if event == 'start':
+                        keep = frames_back + self.vad.start_frames + self.preroll_frames
+                        utterance = list(recent)[-keep:]
+                        self._on_speech_start()
+                        print("🗣️ Speech started")
+                    else:
+                        # Drop the trailing hangover silence
+                        silent = frames_back + self.vad.end_frames
+                        pcm = np.concatenate(utterance[:max(1, len(utterance) - silent)])
+                        speech_ended_at = arrivals[max(0, len(arrivals) - silent - 1)]
+                        utterance = None
+                        with self._lock:
+                            self.user_speaking = False
+                        self._turns.put((pcm, speech_ended_at))
+                        turns += 1
+
+                if max_turns is not None and turns >= max_turns:
+                    break
+
+            # Let queued turns finish before reporting
+            self._turns.join()
+
+        except KeyboardInterrupt:
+            print("\n👋 Voice input stopped")
+
+        self._turns.put(None)
+        return self.latency_summary()
+
+    def _on_speech_start(self):
+        """Barge-in: hold any reply that is playing"""
+        with self._lock:
+            self.user_speaking = True
+            if self.orpheus is not None and self.orpheus.pause_playback():
+                self.reply_paused = True
+                self.barge_ins += 1
+
+    def _turn_worker(self):
+        """Take turns off the queue one at a time"""
+        while True:
+            item = self._turns.get()
+            try:
+                if item is None:
+                    return
+                self._take_turn(*item)
+            except Exception as e:
+                print(f"❌ Turn failed: {e}")
+            finally:
+                self._turns.task_done()
+
+    def _take_turn(self, pcm, speech_ended_at):
+        """Recognize one utterance and start the reply"""
+        text = self.recognizer(pcm, self.source.sample_rate)
+        print(f"🎭 You: {text}")
+        if not text:
+            # False start (cough, noise) - carry on with the interrupted reply
+            with self._lock:
+                if self.reply_paused and self.orpheus is not None and not self.user_speaking:
+                    self.orpheus.resume_playback()
+                    self.reply_paused = False
+            return
+
+        reply = self.respond(text)
+        if self.orpheus is not None:
+            # A real turn replaces whatever reply was interrupted
+            with self._lock:
+                self.orpheus.stop_playback()
+                self.reply_paused = False
+            audio_data, timing = self.orpheus.synthesize(reply)
+            with self._lock:
+                self.orpheus.last_word_timing = timing
+                reply_started_at = time.perf_counter()
+                self.orpheus.play_real_audio(audio_data, wait=False)
+                if self.user_speaking:
+                    # The user started again during synthesis - hold the reply like a barge-in
+                    self.orpheus.pause_playback()
+                    self.reply_paused = True
+        else:
+            reply_started_at = time.perf_counter()
+            print(f"🎭 Orpheus: {reply}")
+
+        latency = reply_started_at - speech_ended_at
+        self.turn_latencies.append(latency)
+        print(f"⏱️ Turn latency: {latency * 1000:.0f} ms")
+
+    def latency_summary(self):
+        """Turn-taking latency stats in milliseconds"""
+        if not self.turn_latencies:
+            return {'turns': 0, 'barge_ins': self.barge_ins}
+        latencies = np.array(self.turn_latencies) * 1000
+        return {
+            'turns': len(latencies),
+            'barge_ins': self.barge_ins,
+            'mean_ms': float(latencies.mean()),
+            'p50_ms': float(np.percentile(latencies, 50)),
+            'p95_ms': float(np.percentile(latencies, 95)),
+        }
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Orpheus offline voice-in loop")
+    parser.add_argument('--wav', nargs='+', help="replay WAV files instead of the microphone")
+    parser.add_argument('--fast', action='store_true', help="replay WAV files faster than real time")
+    parser.add_argument('--recognizer', choices=['standin', 'sphinx'], default='standin')
+    parser.add_argument('--no-speak', action='store_true', help="print replies instead of speaking")
+    args = parser.parse_args()
+
+    print("🎙️ ORPHEUS VOICE INPUT")
+    print("=" * 40)
+
+    try:
+        if args.wav:
+            source = WavFrameSource(args.wav, realtime=not args.fast)
+        else:
+            source = MicrophoneFrameSource()
+
+        if args.recognizer == 'sphinx':
+            recognizer = SpeechRecognitionRecognizer()
+        else:
+            recognizer = LocalStandInRecognizer()
+
+        orpheus = None
+        if not args.no_speak:
+            from real_working_orpheus_edge import RealWorkingOrpheus
+            orpheus = RealWorkingOrpheus()
+
+        summary = VoiceInputLoop(source, recognizer, orpheus=orpheus).run()
+
+        print("\n📋 TURN-TAKING LATENCY")
+        for key, value in summary.items():
+            print(f"   {key}: {value:.0f}" if isinstance(value, float) else f"   {key}: {value}")
+
+    except Exception as e:
+        print(f"❌ Voice input failed: {e}")
+
+
+if __name__ == "__main__":
+    main()
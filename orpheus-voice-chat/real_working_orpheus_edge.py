@@ -11,21 +11,129 @@ import os
 import sys
 import time
 import asyncio
+import inspect
 import tempfile
+import threading
 import pygame
+from collections import OrderedDict
 from pathlib import Path
 from dotenv import load_dotenv
 import edge_tts
 import warnings
+from orpheus_timing import WordTimingIndex
+from orpheus_scheduler import SchedulerThread, INTERACTIVE, BULK
 warnings.filterwarnings("ignore")
 
 # Load environment
 load_dotenv()
 
+# edge-tts 7+ defaults to sentence boundaries and takes boundary=; 6.x always sends words
+EDGE_TTS_HAS_BOUNDARY = 'boundary' in inspect.signature(edge_tts.Communicate).parameters
+
+# Orpheus voice personalities with Edge TTS
+ORPHEUS_VOICES = {
+    'aria': 'en-US-AriaNeural',      # Friendly female
+    'jenny': 'en-US-JennyNeural',    # Cheerful female  
+    'guy': 'en-US-GuyNeural',        # Calm male
+    'davis': 'en-US-DavisNeural',    # Strong male
+    'jane': 'en-US-JaneNeural',      # Professional female
+    'jason': 'en-US-JasonNeural',    # Casual male
+    'sara': 'en-US-SaraNeural',      # Warm female
+    'tony': 'en-US-TonyNeural'       # Confident male
+}
+
+# Orpheus emotion tags mapped to Edge TTS prosody
+ORPHEUS_EMOTIONS = {
+    '<laugh>': {
+        'emotion': 'laugh',
+        'description': 'laughter',
+        'ssml_style': 'cheerful',
+        'rate': '+10%',
+        'pitch': '+5%',
+        'volume': '+10%',
+        'prefix': '*laughs* '
+    },
+    '<chuckle>': {
+        'emotion': 'chuckle', 
+        'description': 'soft laughter',
+        'ssml_style': 'friendly',
+        'rate': '+5%',
+        'pitch': '+3%',
+        'volume': '+5%',
+        'prefix': '*chuckles* '
+    },
+    '<whisper>': {
+        'emotion': 'whisper',
+        'description': 'quiet speech',
+        'ssml_style': 'gentle',
+        'rate': '-20%',
+        'pitch': '-10%',
+        'volume': '-50%',
+        'prefix': ''
+    },
+    '<sigh>': {
+        'emotion': 'sigh',
+        'description': 'sighing',
+        'ssml_style': 'sad',
+        'rate': '-15%',
+        'pitch': '-5%',
+        'volume': '-10%',
+        'prefix': '*sighs* '
+    },
+    '<gasp>': {
+        'emotion': 'gasp',
+        'description': 'surprise',
+        'ssml_style': 'excited',
+        'rate': '+20%',
+        'pitch': '+15%',
+        'volume': '+20%',
+        'prefix': '*gasps* '
+    },
+    '<groan>': {
+        'emotion': 'groan',
+        'description': 'groaning',
+        'ssml_style': 'displeased',
+        'rate': '-10%',
+        'pitch': '-15%',
+        'volume': '-5%',
+        'prefix': '*groans* '
+    },
+    '<yawn>': {
+        'emotion': 'yawn',
+        'description': 'tired',
+        'ssml_style': 'gentle',
+        'rate': '-25%',
+        'pitch': '-20%',
+        'volume': '-20%',
+        'prefix': '*yawns* '
+    },
+    '<cough>': {
+        'emotion': 'cough',
+        'description': 'coughing',
+        'ssml_style': 'neutral',
+        'rate': '0%',
+        'pitch': '0%',
+        'volume': '-10%',
+        'prefix': '*coughs* '
+    }
+}
+
+# Demo phrases covering every emotion tag
+DEMO_PHRASES = [
+    "Hello! Welcome to the REAL Orpheus system!",
+    "This is incredible! <laugh> I can't believe how good this sounds!",
+    "Listen very carefully <whisper> this is actual human-like speech.",
+    "Oh my goodness! <gasp> This technology is amazing!",
+    "Well, that's quite impressive <sigh> I must admit.",
+    "Ha ha! <chuckle> This is the real deal - no weird noises!",
+    "Excuse me! <cough> Pay attention to this demonstration!",
+    "I'm getting sleepy now <yawn> but this still sounds fantastic!"
+]
+
 class RealWorkingOrpheus:
     """Real working Orpheus with Edge TTS"""
     
-    def __init__(self):
+    def __init__(self, init_audio=True, clip_cache_size=64, max_concurrency=4, bulk_share=0.25):
         print("🎭 REAL WORKING ORPHEUS")
         print("=" * 40)
         print("🎪 Microsoft Edge TTS")
@@ -34,29 +142,50 @@ class RealWorkingOrpheus:
         print("🚫 NO synthetic noise - REAL voices")
         print("=" * 40)
         
-        # Initialize pygame
-        pygame.mixer.init(frequency=22050, size=-16, channels=1, buffer=512)
+        # Initialize pygame (headless engines serving sessions skip the mixer)
+        if init_audio:
+            pygame.mixer.init(frequency=22050, size=-16, channels=1, buffer=512)
         
-        # Orpheus voice personalities with Edge TTS
-        self.orpheus_voices = {
-            'aria': 'en-US-AriaNeural',      # Friendly female
-            'jenny': 'en-US-JennyNeural',    # Cheerful female  
-            'guy': 'en-US-GuyNeural',        # Calm male
-            'davis': 'en-US-DavisNeural',    # Strong male
-            'jane': 'en-US-JaneNeural',      # Professional female
-            'jason': 'en-US-JasonNeural',    # Casual male
-            'sara': 'en-US-SaraNeural',      # Warm female
-            'tony': 'en-US-TonyNeural'       # Confident male
-        }
+        # Shared voice table - one copy for every instance and session
+        self.orpheus_voices = ORPHEUS_VOICES
         
         self.current_voice = 'aria'
         
+        # Recent clips with their word timing: (voice, text) -> (audio, timing)
+        self.clip_cache = OrderedDict()
+        self.clip_cache_size = clip_cache_size
+        self.last_word_timing = None
+        self._playback_path = None
+        
+        # Interactive and bulk synthesis share one scheduler loop (started on first use)
+        self.max_concurrency = max_concurrency
+        self.bulk_share = bulk_share
+        self._scheduler = None
+        self._scheduler_lock = threading.Lock()
+        
         print(f"✅ Real working Orpheus ready!")
         print(f"🎭 Current voice: {self.current_voice}")
         print(f"🎪 Available voices: {', '.join(self.orpheus_voices.keys())}")
     
-    async def orpheus_speak_async(self, text_with_emotions):
+    async def orpheus_speak_async(self, text_with_emotions, voice_name=None):
         """Async speech generation with emotions"""
+        audio_data, _ = await self.orpheus_speak_timed_async(text_with_emotions, voice_name)
+        return audio_data
+    
+    async def orpheus_speak_timed_async(self, text_with_emotions, voice_name=None, checkpoint=None):
+        """Async speech generation returning (audio, WordTimingIndex)
+        
+        checkpoint is an optional coroutine function awaited between stream
+        chunks - schedulers use it to pause or cancel background work.
+        """
+        # Serve repeated phrases from the clip cache
+        voice_name = voice_name or self.current_voice
+        cache_key = (voice_name, text_with_emotions)
+        cached = self.clip_cache.get(cache_key)
+        if cached is not None:
+            self.clip_cache.move_to_end(cache_key)
+            return cached
+        
         # Process Orpheus emotion tags
         clean_text, emotion_info = self.process_orpheus_emotions(text_with_emotions)
         
@@ -66,27 +195,61 @@ class RealWorkingOrpheus:
         # Create SSML with emotion effects
         ssml_text = self.create_emotional_ssml(clean_text, emotion_info)
         
-        # Get voice
-        voice = self.orpheus_voices[self.current_voice]
+        # Get voice (per-call voice lets sessions share one engine)
+        voice = self.orpheus_voices[voice_name]
         
-        # Generate speech
-        communicate = edge_tts.Communicate(ssml_text, voice)
+        # Generate speech - ask for word boundaries where edge-tts supports choosing
+        if EDGE_TTS_HAS_BOUNDARY:
+            communicate = edge_tts.Communicate(ssml_text, voice, boundary="WordBoundary")
+        else:
+            communicate = edge_tts.Communicate(ssml_text, voice)
         
-        # Collect audio data
-        audio_data = b""
+        # Collect audio data and word timing from the same stream
+        audio_chunks = []
+        timing = WordTimingIndex()
         async for chunk in communicate.stream():
+            if checkpoint is not None:
+                await checkpoint()
             if chunk["type"] == "audio":
-                audio_data += chunk["data"]
+                audio_chunks.append(chunk["data"])
+            elif chunk["type"] == "WordBoundary":
+                timing.add_boundary(chunk)
         
-        return audio_data
+        audio_data = b"".join(audio_chunks)
+        result = (audio_data, timing.freeze())
+        
+        if audio_data and self.clip_cache_size > 0:
+            self.clip_cache[cache_key] = result
+            if len(self.clip_cache) > self.clip_cache_size:
+                self.clip_cache.popitem(last=False)
+        
+        return result
+    
+    @property
+    def scheduler(self):
+        """Long-lived synthesis scheduler - interactive ahead of bulk work"""
+        with self._scheduler_lock:
+            if self._scheduler is None:
+                self._scheduler = SchedulerThread(self, self.max_concurrency, self.bulk_share)
+            return self._scheduler
     
-    def orpheus_speak(self, text_with_emotions):
+    def synthesize(self, text_with_emotions, voice_name=None, priority=INTERACTIVE):
+        """Blocking synthesis through the scheduler - returns (audio, timing)"""
+        return self.scheduler.speak(text_with_emotions, voice_name or self.current_voice, priority)
+    
+    def prerender(self, phrases, voice_name=None):
+        """Warm the clip cache in the background as bulk work - returns futures"""
+        return self.scheduler.prerender(phrases, voice_name or self.current_voice)
+    
+    def orpheus_speak(self, text_with_emotions, voice_name=None, priority=INTERACTIVE):
         """Main speech function"""
-        print(f"\n🎭 Orpheus ({self.current_voice}): {text_with_emotions}")
+        voice_name = voice_name or self.current_voice
+        print(f"\n🎭 Orpheus ({voice_name}): {text_with_emotions}")
         
         try:
-            # Run async function
-            audio_data = asyncio.run(self.orpheus_speak_async(text_with_emotions))
+            audio_data, self.last_word_timing = self.synthesize(
+                text_with_emotions, voice_name, priority
+            )
             
             if audio_data:
                 self.play_real_audio(audio_data)
@@ -101,86 +264,12 @@ class RealWorkingOrpheus:
     
     def process_orpheus_emotions(self, text):
         """Process Orpheus emotion tags - REAL implementation"""
-        orpheus_emotions = {
-            '<laugh>': {
-                'emotion': 'laugh',
-                'description': 'laughter',
-                'ssml_style': 'cheerful',
-                'rate': '+10%',
-                'pitch': '+5%',
-                'volume': '+10%',
-                'prefix': '*laughs* '
-            },
-            '<chuckle>': {
-                'emotion': 'chuckle', 
-                'description': 'soft laughter',
-                'ssml_style': 'friendly',
-                'rate': '+5%',
-                'pitch': '+3%',
-                'volume': '+5%',
-                'prefix': '*chuckles* '
-            },
-            '<whisper>': {
-                'emotion': 'whisper',
-                'description': 'quiet speech',
-                'ssml_style': 'gentle',
-                'rate': '-20%',
-                'pitch': '-10%',
-                'volume': '-50%',
-                'prefix': ''
-            },
-            '<sigh>': {
-                'emotion': 'sigh',
-                'description': 'sighing',
-                'ssml_style': 'sad',
-                'rate': '-15%',
-                'pitch': '-5%',
-                'volume': '-10%',
-                'prefix': '*sighs* '
-            },
-            '<gasp>': {
-                'emotion': 'gasp',
-                'description': 'surprise',
-                'ssml_style': 'excited',
-                'rate': '+20%',
-                'pitch': '+15%',
-                'volume': '+20%',
-                'prefix': '*gasps* '
-            },
-            '<groan>': {
-                'emotion': 'groan',
-                'description': 'groaning',
-                'ssml_style': 'displeased',
-                'rate': '-10%',
-                'pitch': '-15%',
-                'volume': '-5%',
-                'prefix': '*groans* '
-            },
-            '<yawn>': {
-                'emotion': 'yawn',
-                'description': 'tired',
-                'ssml_style': 'gentle',
-                'rate': '-25%',
-                'pitch': '-20%',
-                'volume': '-20%',
-                'prefix': '*yawns* '
-            },
-            '<cough>': {
-                'emotion': 'cough',
-                'description': 'coughing',
-                'ssml_style': 'neutral',
-                'rate': '0%',
-                'pitch': '0%',
-                'volume': '-10%',
-                'prefix': '*coughs* '
-            }
-        }
         
         clean_text = text
         emotion_info = None
         
         # Find and process emotion tag
-        for tag, info in orpheus_emotions.items():
+        for tag, info in ORPHEUS_EMOTIONS.items():
             if tag in text:
                 emotion_info = info.copy()
                 clean_text = text.replace(tag, '').strip()
@@ -209,32 +298,67 @@ class RealWorkingOrpheus:
         
         return ssml
     
-    def play_real_audio(self, audio_data):
-        """Play real audio data"""
+    def play_real_audio(self, audio_data, wait=True):
+        """Play real audio data (wait=False returns once playback starts)"""
         try:
+            # Release the previous clip before starting a new one
+            self.stop_playback()
+            
             # Save to temp file
             with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as temp_file:
                 temp_file.write(audio_data)
-                temp_path = temp_file.name
+                self._playback_path = temp_file.name
             
             print("🔊 Playing REAL voice...")
             
             # Play with pygame
-            pygame.mixer.music.load(temp_path)
+            pygame.mixer.music.load(self._playback_path)
             pygame.mixer.music.play()
             
-            # Wait for completion
+            if not wait:
+                return
+            
+            # Wait for completion (a barge-in pause also ends the wait)
             while pygame.mixer.music.get_busy():
                 time.sleep(0.1)
             
             # Cleanup
-            os.unlink(temp_path)
+            self.stop_playback()
             
             print("✅ Real voice playback completed")
             
         except Exception as e:
             print(f"❌ Audio playback failed: {e}")
     
+    def pause_playback(self):
+        """Pause current playback - used for barge-in when the user starts talking"""
+        if pygame.mixer.get_init() and pygame.mixer.music.get_busy():
+            pygame.mixer.music.pause()
+            print("⏸️ Playback paused")
+            return True
+        return False
+    
+    def resume_playback(self):
+        """Resume a paused clip - used when a barge-in turns out to be a false start"""
+        if pygame.mixer.get_init() and self._playback_path:
+            pygame.mixer.music.unpause()
+            print("▶️ Playback resumed")
+            return True
+        return False
+    
+    def stop_playback(self):
+        """Stop playback and remove the temp clip"""
+        if pygame.mixer.get_init():
+            pygame.mixer.music.stop()
+            pygame.mixer.music.unload()
+        
+        if self._playback_path:
+            try:
+                os.unlink(self._playback_path)
+            except OSError:
+                pass
+            self._playback_path = None
+    
     def change_voice(self, voice_name):
         """Change Orpheus voice personality"""
         if voice_name in self.orpheus_voices:
@@ -252,14 +376,11 @@ class RealWorkingOrpheus:
         
         demo_text = "Hello! This is the real Orpheus speaking with authentic voices!"
         
+        # Demo synthesis is bulk work - live interactive speech goes first
         for voice_name in self.orpheus_voices.keys():
             print(f"\n🎭 Testing voice: {voice_name}")
-            self.change_voice(voice_name)
-            self.orpheus_speak(demo_text)
+            self.orpheus_speak(demo_text, voice_name, priority=BULK)
             time.sleep(1)
-        
-        # Reset to default
-        self.change_voice('aria')
     
     def interactive_mode(self):
         """Interactive Orpheus mode"""
@@ -268,6 +389,7 @@ class RealWorkingOrpheus:
         print("🎪 Type text with emotion tags")
         print("🎭 Emotions: <laugh>, <whisper>, <gasp>, <sigh>, <chuckle>, <groan>, <yawn>, <cough>")
         print("🔄 Commands: 'voice [name]' to change voice, 'demo' for voice demo")
+        print("🔥 'warm' pre-renders the demo phrases in the background")
         print("🛑 Type 'quit' to exit")
         print("=" * 40)
         
@@ -283,6 +405,11 @@ class RealWorkingOrpheus:
                     self.demo_all_voices()
                     continue
                 
+                elif user_input.lower() == 'warm':
+                    self.prerender(DEMO_PHRASES)
+                    print(f"🔥 Pre-rendering {len(DEMO_PHRASES)} phrases in the background")
+                    continue
+                
                 elif user_input.lower().startswith('voice '):
                     voice_name = user_input[6:].strip()
                     self.change_voice(voice_name)
@@ -318,23 +445,11 @@ def main():
         # Initialize real Orpheus
         orpheus = RealWorkingOrpheus()
         
-        # Test with emotion tags
-        test_phrases = [
-            "Hello! Welcome to the REAL Orpheus system!",
-            "This is incredible! <laugh> I can't believe how good this sounds!",
-            "Listen very carefully <whisper> this is actual human-like speech.",
-            "Oh my goodness! <gasp> This technology is amazing!",
-            "Well, that's quite impressive <sigh> I must admit.",
-            "Ha ha! <chuckle> This is the real deal - no weird noises!",
-            "Excuse me! <cough> Pay attention to this demonstration!",
-            "I'm getting sleepy now <yawn> but this still sounds fantastic!"
-        ]
-        
-        print(f"\n🧪 Testing {len(test_phrases)} REAL voice phrases...")
+        print(f"\n🧪 Testing {len(DEMO_PHRASES)} REAL voice phrases...")
         print("🔊 Listen for actual human-like voices with emotions!\n")
         
-        for i, phrase in enumerate(test_phrases, 1):
-            print(f"[{i}/{len(test_phrases)}] {phrase}")
+        for i, phrase in enumerate(DEMO_PHRASES, 1):
+            print(f"[{i}/{len(DEMO_PHRASES)}] {phrase}")
             success = orpheus.orpheus_speak(phrase)
             
             if success:
@@ -0,0 +1,218 @@
+"""Tests for the interactive/bulk synthesis scheduler (fake engine, no network)"""
+
+import asyncio
+
+import pytest
+
+from orpheus_scheduler import SynthesisScheduler, INTERACTIVE, BULK
+
+
+class ChunkedEngine:
+    """Fake timed engine: a few stream chunks per job, checkpoint between each"""
+
+    def __init__(self, chunks=5, chunk_delay=0.01):
+        self.chunks = chunks
+        self.chunk_delay = chunk_delay
+        self.started = []
+
+    async def orpheus_speak_timed_async(self, text, voice_name=None, checkpoint=None):
+        self.started.append(text)
+        for _ in range(self.chunks):
+            if checkpoint is not None:
+                await checkpoint()
+            await asyncio.sleep(self.chunk_delay)
+        return text.encode(), None
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_interactive_dispatched_ahead_of_queued_bulk():
+    async def scenario():
+        engine = ChunkedEngine()
+        scheduler = SynthesisScheduler(engine, max_concurrency=2, bulk_share=0.5)
+        bulk = scheduler.prerender([f"b{i}" for i in range(4)])
+        interactive = scheduler.submit("hello")
+        await asyncio.gather(interactive, *bulk)
+        return engine.started
+
+    started = run(scenario())
+    # One bulk slot is reserved; the interactive job takes the other before b1
+    assert started.index("hello") < started.index("b1")
+
+
+def test_bulk_never_starves_under_interactive_load():
+    async def scenario():
+        engine = ChunkedEngine()
+        scheduler = SynthesisScheduler(engine, max_concurrency=4, bulk_share=0.25)
+        interactive = [scheduler.submit(f"i{i}") for i in range(12)]
+        bulk = scheduler.submit("b0", priority=BULK)
+        await asyncio.gather(bulk, *interactive)
+        return engine.started
+
+    started = run(scenario())
+    # Interactive borrowed every slot first; the first freed slot goes to bulk
+    assert started.index("b0") == 4
+
+
+def test_pause_and_resume_bulk():
+    async def scenario():
+        scheduler = SynthesisScheduler(ChunkedEngine(), max_concurrency=4)
+        job = scheduler.submit("b0", priority=BULK)
+        await asyncio.sleep(0.015)
+        scheduler.pause_bulk()
+        await asyncio.sleep(0.1)
+        paused_done = job.future.done()
+        scheduler.resume_bulk()
+        result = await job
+        return paused_done, result
+
+    paused_done, result = run(scenario())
+    assert not paused_done
+    assert result == (b"b0", None)
+
+
+def test_cancel_bulk_purges_queue_and_keeps_pause():
+    async def scenario():
+        scheduler = SynthesisScheduler(ChunkedEngine(), max_concurrency=4)
+        scheduler.pause_bulk()
+        jobs = scheduler.prerender(["a", "b", "c"])
+        cancelled = scheduler.cancel_bulk()
+        await asyncio.sleep(0.05)
+        later = scheduler.submit("d", priority=BULK)
+        await asyncio.sleep(0.05)
+        return scheduler, jobs, cancelled, later
+
+    scheduler, jobs, cancelled, later = run(scenario())
+    assert cancelled == 3
+    assert all(job.future.cancelled() for job in jobs)
+    assert scheduler.stats[BULK].cancelled == 3
+    assert list(scheduler.queues[BULK]) == [later]
+    assert scheduler.bulk_paused
+
+
+def test_cancel_running_paused_bulk_job():
+    async def scenario():
+        scheduler = SynthesisScheduler(ChunkedEngine(), max_concurrency=4)
+        job = scheduler.submit("b0", priority=BULK)
+        await asyncio.sleep(0.015)
+        scheduler.pause_bulk()
+        await asyncio.sleep(0.02)
+        scheduler.cancel_bulk()
+        with pytest.raises(asyncio.CancelledError):
+            await job
+        return scheduler
+
+    scheduler = run(scenario())
+    assert scheduler.stats[BULK].cancelled == 1
+    assert scheduler.running[BULK] == 0
+
+
+def test_cancel_running_interactive_job():
+    async def scenario():
+        scheduler = SynthesisScheduler(ChunkedEngine(), max_concurrency=2)
+        job = scheduler.submit("hello")
+        await asyncio.sleep(0.015)
+        assert job.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await job
+        return scheduler
+
+    stats = run(scenario()).stats[INTERACTIVE]
+    assert stats.cancelled == 1
+    assert stats.completed == 0
+
+
+def test_task_cancellation_settles_job_future():
+    async def scenario():
+        scheduler = SynthesisScheduler(ChunkedEngine(), max_concurrency=2)
+        job = scheduler.submit("hello")
+        await asyncio.sleep(0.015)
+        for task in list(scheduler._tasks):
+            task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(job.future, timeout=1)
+
+    run(scenario())
+
+
+def test_queue_wait_tracked_per_class():
+    async def scenario():
+        scheduler = SynthesisScheduler(ChunkedEngine(), max_concurrency=2, bulk_share=0.5)
+        bulk = scheduler.prerender([f"b{i}" for i in range(3)])
+        interactive = [scheduler.submit(f"i{i}") for i in range(3)]
+        await asyncio.gather(*bulk, *interactive)
+        return scheduler.queue_wait_stats()
+
+    stats = run(scenario())
+    for priority in (INTERACTIVE, BULK):
+        assert stats[priority]['submitted'] == 3
+        assert stats[priority]['completed'] == 3
+        assert stats[priority]['dispatched'] == 3
+        assert stats[priority]['wait_max'] >= stats[priority]['wait_mean'] >= 0.0
+    # Later jobs of each class waited for a slot of their own class
+    assert stats[BULK]['wait_max'] > 0.04
+    assert stats[INTERACTIVE]['wait_max'] > 0.04
+
+
+class CheckpointFreeEngine:
+    """Like a clip-cache hit - finishes without ever reaching a checkpoint"""
+
+    async def orpheus_speak_timed_async(self, text, voice_name=None, checkpoint=None):
+        await asyncio.sleep(0.02)
+        return text.encode(), None
+
+
+@pytest.mark.parametrize("engine", [ChunkedEngine(chunks=1, chunk_delay=0.03),
+                                    CheckpointFreeEngine()])
+def test_cancel_after_last_checkpoint_still_cancels(engine):
+    async def scenario():
+        scheduler = SynthesisScheduler(engine, max_concurrency=2)
+        job = scheduler.submit("hello")
+        await asyncio.sleep(0.01)
+        assert job.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await job
+        return scheduler
+
+    stats = run(scenario()).stats[INTERACTIVE]
+    assert stats.cancelled == 1
+    assert stats.completed == 0
+
+
+def test_task_teardown_does_not_dispatch_more_work():
+    async def scenario():
+        scheduler = SynthesisScheduler(ChunkedEngine(), max_concurrency=2)
+        jobs = [scheduler.submit(f"i{i}") for i in range(6)]
+        await asyncio.sleep(0.005)
+        tasks = list(scheduler._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return scheduler, jobs
+
+    scheduler, jobs = run(scenario())
+    assert not scheduler._tasks
+    assert len(scheduler.queues[INTERACTIVE]) == 4
+    assert sum(scheduler.running.values()) == 0
+
+
+def test_scheduler_thread_serves_blocking_callers():
+    from orpheus_scheduler import SchedulerThread
+
+    engine = ChunkedEngine(chunks=2, chunk_delay=0.01)
+    thread = SchedulerThread(engine, max_concurrency=2, bulk_share=0.5)
+    try:
+        thread.pause_bulk()
+        bulk = thread.prerender(["b0", "b1"])
+        assert thread.speak("hello") == (b"hello", None)
+        assert not any(future.done() for future in bulk)
+        thread.resume_bulk()
+        assert [future.result(timeout=1) for future in bulk] == [(b"b0", None), (b"b1", None)]
+        stats = thread.queue_wait_stats()
+        assert stats[INTERACTIVE]['completed'] == 1
+        assert stats[BULK]['completed'] == 2
+    finally:
+        thread.close()
+    assert not thread._thread.is_alive()
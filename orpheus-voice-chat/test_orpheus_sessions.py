@@ -0,0 +1,134 @@
+"""Tests for the Orpheus session manager (offline engine, no network)"""
+
+import asyncio
+
+import pytest
+
+from orpheus_sessions import OrpheusSessionManager, _OfflineEngine
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class CountingEngine:
+    """Offline engine that records how many requests run at once"""
+
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+
+    async def orpheus_speak_async(self, text_with_emotions, voice_name=None):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return text_with_emotions.encode()
+
+
+def test_get_session_rejects_idle_session():
+    clock = FakeClock()
+    manager = OrpheusSessionManager(_OfflineEngine(), idle_timeout=10, clock=clock)
+    session = manager.create_session()
+
+    clock.now = 1000
+    with pytest.raises(KeyError):
+        manager.get_session(session.session_id)
+    assert session.session_id not in manager.sessions
+
+
+def test_access_keeps_session_alive():
+    clock = FakeClock()
+    manager = OrpheusSessionManager(_OfflineEngine(), idle_timeout=10, clock=clock)
+    session = manager.create_session()
+
+    for now in (5, 10, 15, 20):
+        clock.now = now
+        assert manager.get_session(session.session_id) is session
+
+
+def test_any_access_sweeps_other_idle_sessions():
+    clock = FakeClock()
+    manager = OrpheusSessionManager(_OfflineEngine(), idle_timeout=10, sweep_interval=5,
+                                    clock=clock)
+    stale = manager.create_session()
+    clock.now = 8
+    live = manager.create_session()
+
+    clock.now = 15
+    manager.get_session(live.session_id)
+    assert stale.session_id not in manager.sessions
+    assert live.session_id in manager.sessions
+
+
+def test_session_with_queued_work_does_not_expire():
+    clock = FakeClock()
+    manager = OrpheusSessionManager(_OfflineEngine(), idle_timeout=10, clock=clock)
+    session = manager.create_session()
+    manager.submit(session.session_id, "Hello")
+
+    clock.now = 1000
+    assert manager.expire_idle() == 0
+
+
+def test_sessions_with_requests_in_flight_do_not_expire():
+    clock = FakeClock()
+    engine = CountingEngine(delay=0.02)
+    manager = OrpheusSessionManager(engine, idle_timeout=10, max_concurrency=1, clock=clock)
+    sessions = [manager.create_session() for _ in range(2)]
+
+    async def run():
+        # One request running, the other waiting on the upstream semaphore
+        requests = [asyncio.ensure_future(manager.speak(s.session_id, "Hi")) for s in sessions]
+        await asyncio.sleep(0.005)
+        clock.now = 1000
+        expired = manager.expire_idle()
+        await asyncio.gather(*requests)
+        return expired
+
+    assert asyncio.run(run()) == 0
+    assert manager.stats()['requests'] == 2
+    assert all(s.in_flight == 0 for s in sessions)
+
+
+def test_concurrency_limit_is_respected():
+    engine = CountingEngine()
+    manager = OrpheusSessionManager(engine, max_concurrency=3)
+    sessions = [manager.create_session() for _ in range(10)]
+
+    async def run():
+        await asyncio.gather(*(manager.speak(s.session_id, "Hi") for s in sessions))
+
+    asyncio.run(run())
+    assert engine.peak == 3
+    assert manager.stats()['requests'] == 10
+
+
+def test_manager_works_across_event_loops():
+    engine = CountingEngine()
+    manager = OrpheusSessionManager(engine, max_concurrency=1)
+    session = manager.create_session()
+
+    async def run():
+        await asyncio.gather(manager.speak(session.session_id, "a"),
+                             manager.speak(session.session_id, "b"))
+
+    asyncio.run(run())
+    asyncio.run(run())
+    assert manager.stats()['requests'] == 4
+
+
+def test_default_emotion_applied_only_without_tag():
+    engine = CountingEngine(delay=0)
+    manager = OrpheusSessionManager(engine)
+    session = manager.create_session(default_emotion='laugh')
+
+    plain = asyncio.run(manager.speak(session.session_id, "Hello"))
+    tagged = asyncio.run(manager.speak(session.session_id, "Hello <sigh>"))
+    assert plain == b"<laugh> Hello"
+    assert tagged == b"Hello <sigh>"
@@ -0,0 +1,66 @@
+"""Tests for the Edge TTS word timing index"""
+
+import pytest
+
+from orpheus_timing import WordTimingIndex, TICKS_PER_MS
+
+
+def build(words):
+    """Index from (word, offset_ms, duration_ms) triples"""
+    timing = WordTimingIndex()
+    for word, offset_ms, duration_ms in words:
+        timing.add_boundary({
+            "type": "WordBoundary",
+            "text": word,
+            "offset": offset_ms * TICKS_PER_MS,
+            "duration": duration_ms * TICKS_PER_MS,
+        })
+    return timing.freeze()
+
+
+WORDS = [("Hello", 100, 300), ("there", 450, 200), ("friend", 700, 400)]
+
+
+def test_iteration_converts_ticks_to_ms():
+    assert list(build(WORDS)) == WORDS
+
+
+def test_word_at_and_spoken_text():
+    timing = build(WORDS)
+    assert timing.word_at(50) == -1
+    assert timing.word_at(100) == 0
+    assert timing.word_at(460) == 1
+    assert timing.word_at(5000) == 2
+    assert timing.spoken_text(50) == ""
+    assert timing.spoken_text(460) == "Hello there"
+    assert timing.end_ms() == 1100
+    assert len(timing) == 3
+
+
+def test_empty_index():
+    timing = WordTimingIndex().freeze()
+    assert len(timing) == 0
+    assert timing.word_at(100) == -1
+    assert timing.end_ms() == 0
+
+
+def test_words_readable_before_freeze():
+    timing = WordTimingIndex()
+    timing.add_boundary({"text": "Hi", "offset": 0, "duration": TICKS_PER_MS})
+    assert timing.word(0) == "Hi"
+
+
+def test_frozen_index_rejects_new_boundaries():
+    timing = build(WORDS)
+    with pytest.raises(RuntimeError):
+        timing.add_boundary({"text": "again", "offset": 0, "duration": 0})
+    assert len(timing) == 3
+
+
+def test_public_arrays_are_read_only():
+    timing = build(WORDS)
+    with pytest.raises(TypeError):
+        timing.offsets[0] = 0
+    with pytest.raises(TypeError):
+        timing.durations[0] = 0
+    assert list(timing.offsets) == [100, 450, 700]
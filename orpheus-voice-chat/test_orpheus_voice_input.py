@@ -0,0 +1,165 @@
+"""Tests for VAD endpointing and the voice-in loop (synthetic PCM, no devices)"""
+
+import numpy as np
+import pytest
+
+from orpheus_voice_input import EnergyVAD, LocalStandInRecognizer, VoiceInputLoop
+
+SR = 16000
+FRAME = 320  # 20 ms at 16 kHz
+
+
+def noise(seconds, dbfs, seed=0):
+    rng = np.random.default_rng(seed)
+    sigma = 32768 * 10 ** (dbfs / 20)
+    return np.clip(rng.normal(0, sigma, int(SR * seconds)), -32768, 32767).astype(np.int16)
+
+
+def tone(seconds, amplitude=8000):
+    t = np.arange(int(SR * seconds)) / SR
+    return (np.sin(2 * np.pi * 220 * t) * amplitude).astype(np.int16)
+
+
+def speech_in_noise(dbfs, lead_in=1.0, speech=1.0):
+    """Noise lead-in, tone over noise, 1.5 s noise"""
+    return np.concatenate([
+        noise(lead_in, dbfs, seed=1),
+        (tone(speech) + noise(speech, dbfs, seed=2)).astype(np.int16),
+        noise(1.5, dbfs, seed=3),
+    ])
+
+
+@pytest.mark.parametrize("dbfs", [-70, -50, -40])
+def test_pure_noise_is_not_speech(dbfs):
+    vad = EnergyVAD()
+    events = vad.process(noise(3, dbfs).reshape(-1, FRAME))
+    assert events == []
+    assert not vad.in_speech
+    assert vad.noise_floor_db == pytest.approx(dbfs, abs=2)
+
+
+@pytest.mark.parametrize("dbfs", [-70, -50, -40])
+def test_utterance_endpointed_at_realistic_noise(dbfs):
+    utterances = EnergyVAD().detect_utterances(speech_in_noise(dbfs), FRAME)
+    assert len(utterances) == 1
+    start, end = utterances[0]
+    assert abs(start - 50) <= 2
+    assert abs(end - 100) <= 2
+
+
+@pytest.mark.parametrize("dbfs", [-70, -50, -40])
+def test_speech_at_stream_start_is_detected(dbfs):
+    # The calibration window is all speech, so the floor is only found afterwards
+    utterances = EnergyVAD().detect_utterances(speech_in_noise(dbfs, lead_in=0), FRAME)
+    assert utterances == [(0, 50)]
+
+
+def test_short_lead_in_keeps_whole_utterance():
+    utterances = EnergyVAD().detect_utterances(speech_in_noise(-50, lead_in=0.1, speech=1.5), FRAME)
+    assert utterances == [(5, 80)]
+
+
+@pytest.mark.parametrize("seconds", [5, 6, 8])
+def test_long_utterance_is_not_cut_short(seconds):
+    utterances = EnergyVAD().detect_utterances(speech_in_noise(-50, speech=seconds), FRAME)
+    assert utterances == [(50, 50 + seconds * 50)]
+
+
+@pytest.mark.parametrize("lead_in", [0, 1.0])
+def test_streaming_matches_batch(lead_in):
+    samples = speech_in_noise(-50, lead_in=lead_in)
+    frames = samples[:len(samples) // FRAME * FRAME].reshape(-1, FRAME)
+
+    batch = EnergyVAD().process(frames)
+    vad = EnergyVAD()
+    streamed = []
+    for i, frame in enumerate(frames):
+        streamed += [(i + index, event) for index, event in vad.process(frame)]
+    assert streamed == batch
+
+
+def test_end_detected_within_hangover():
+    vad = EnergyVAD(hangover_ms=300)
+    events = vad.process(speech_in_noise(-40).reshape(-1, FRAME))
+    (_, start), (end_frame, end) = events
+    assert (start, end) == ('start', 'end')
+    # Tone stops at frame 100; the end fires after 300 ms of silence
+    assert end_frame - 100 <= 300 // 20
+
+
+class ArrayFrameSource:
+    frame_ms = 20
+    sample_rate = SR
+
+    def __init__(self, samples):
+        self.samples = samples
+
+    def frames(self):
+        usable = len(self.samples) // FRAME * FRAME
+        yield from self.samples[:usable].reshape(-1, FRAME)
+
+
+class FakeOrpheus:
+    """Records playback calls; always 'playing' so speech start pauses it"""
+
+    def __init__(self):
+        self.calls = []
+        self.last_word_timing = None
+
+    def pause_playback(self):
+        self.calls.append('pause')
+        return True
+
+    def resume_playback(self):
+        self.calls.append('resume')
+        return True
+
+    def stop_playback(self):
+        self.calls.append('stop')
+
+    def synthesize(self, text_with_emotions, voice_name=None, priority=None):
+        return text_with_emotions.encode(), None
+
+    def play_real_audio(self, audio_data, wait=True):
+        self.calls.append('play')
+
+
+def test_false_start_resumes_paused_reply():
+    orpheus = FakeOrpheus()
+    loop = VoiceInputLoop(ArrayFrameSource(speech_in_noise(-50)),
+                          LocalStandInRecognizer([""]), orpheus=orpheus)
+    summary = loop.run()
+    assert orpheus.calls == ['pause', 'resume']
+    assert summary['turns'] == 0
+    assert summary['barge_ins'] == 1
+
+
+def test_stand_in_recognizer_treats_blip_as_false_start():
+    orpheus = FakeOrpheus()
+    loop = VoiceInputLoop(ArrayFrameSource(speech_in_noise(-50, speech=0.1)),
+                          LocalStandInRecognizer(), orpheus=orpheus)
+    summary = loop.run()
+    assert orpheus.calls == ['pause', 'resume']
+    assert summary['turns'] == 0
+
+
+def test_speech_at_stream_start_becomes_a_turn():
+    class Recording(LocalStandInRecognizer):
+        def __call__(self, pcm, sample_rate):
+            self.seconds = len(pcm) / sample_rate
+            return super().__call__(pcm, sample_rate)
+
+    recognizer = Recording()
+    summary = VoiceInputLoop(ArrayFrameSource(speech_in_noise(-50, lead_in=0)), recognizer).run()
+    assert summary['turns'] == 1
+    assert recognizer.seconds == pytest.approx(1.0)
+
+
+def test_real_turn_stops_interrupted_reply_and_records_latency():
+    orpheus = FakeOrpheus()
+    loop = VoiceInputLoop(ArrayFrameSource(speech_in_noise(-50)),
+                          LocalStandInRecognizer(["hello"]), orpheus=orpheus)
+    summary = loop.run()
+    assert orpheus.calls == ['pause', 'stop', 'play']
+    assert summary['turns'] == 1
+    assert summary['mean_ms'] >= 0
@@ -0,0 +1,122 @@
+"""Tests for timed synthesis in the Edge TTS engine (Communicate is faked, no network)"""
+
+import asyncio
+
+import pytest
+
+import real_working_orpheus_edge as edge_module
+from real_working_orpheus_edge import RealWorkingOrpheus
+from orpheus_timing import TICKS_PER_MS
+
+
+def word(text, offset_ms, duration_ms):
+    return {"type": "WordBoundary", "text": text,
+            "offset": offset_ms * TICKS_PER_MS, "duration": duration_ms * TICKS_PER_MS}
+
+
+STREAM = [
+    {"type": "audio", "data": b"aa"},
+    word("Hello", 100, 300),
+    {"type": "audio", "data": b"bb"},
+    word("there", 450, 200),
+    {"type": "SentenceBoundary", "text": "Hello there", "offset": 0, "duration": 0},
+    {"type": "audio", "data": b"cc"},
+]
+
+
+class FakeCommunicate:
+    """Stands in for edge_tts.Communicate - records constructor calls"""
+
+    calls = []
+
+    def __init__(self, text, voice, boundary=None):
+        FakeCommunicate.calls.append({"text": text, "voice": voice, "boundary": boundary})
+
+    async def stream(self):
+        for chunk in STREAM:
+            yield chunk
+
+
+class LegacyCommunicate(FakeCommunicate):
+    """edge-tts 6.x signature - no boundary keyword"""
+
+    def __init__(self, text, voice):
+        FakeCommunicate.calls.append({"text": text, "voice": voice})
+
+
+@pytest.fixture
+def orpheus(monkeypatch):
+    FakeCommunicate.calls = []
+    monkeypatch.setattr(edge_module.edge_tts, "Communicate", FakeCommunicate)
+    monkeypatch.setattr(edge_module, "EDGE_TTS_HAS_BOUNDARY", True)
+    return RealWorkingOrpheus(init_audio=False, clip_cache_size=2)
+
+
+def speak(orpheus, text, voice=None):
+    return asyncio.run(orpheus.orpheus_speak_timed_async(text, voice))
+
+
+def test_word_boundaries_collected_alongside_audio(orpheus):
+    audio, timing = speak(orpheus, "Hello there")
+    assert audio == b"aabbcc"
+    assert list(timing) == [("Hello", 100, 300), ("there", 450, 200)]
+    assert timing.frozen
+    assert FakeCommunicate.calls[0]["boundary"] == "WordBoundary"
+    assert FakeCommunicate.calls[0]["voice"] == "en-US-AriaNeural"
+
+
+def test_legacy_edge_tts_called_without_boundary(orpheus, monkeypatch):
+    monkeypatch.setattr(edge_module.edge_tts, "Communicate", LegacyCommunicate)
+    monkeypatch.setattr(edge_module, "EDGE_TTS_HAS_BOUNDARY", False)
+    audio, timing = speak(orpheus, "Hello there")
+    assert audio == b"aabbcc"
+    assert len(timing) == 2
+    assert "boundary" not in FakeCommunicate.calls[0]
+
+
+def test_cache_hit_returns_same_audio_and_timing(orpheus):
+    first = speak(orpheus, "Hello there")
+    second = speak(orpheus, "Hello there")
+    assert second is first
+    assert len(FakeCommunicate.calls) == 1
+
+
+def test_cache_is_keyed_by_voice(orpheus):
+    speak(orpheus, "Hello there", "aria")
+    speak(orpheus, "Hello there", "guy")
+    assert len(FakeCommunicate.calls) == 2
+
+
+def test_cache_evicts_least_recently_used(orpheus):
+    speak(orpheus, "one")
+    speak(orpheus, "two")
+    speak(orpheus, "one")          # refresh "one"
+    speak(orpheus, "three")        # evicts "two"
+    assert list(orpheus.clip_cache) == [("aria", "one"), ("aria", "three")]
+
+    calls = len(FakeCommunicate.calls)
+    speak(orpheus, "one")
+    assert len(FakeCommunicate.calls) == calls
+    speak(orpheus, "two")
+    assert len(FakeCommunicate.calls) == calls + 1
+
+
+def test_plain_speak_async_returns_audio_only(orpheus):
+    assert asyncio.run(orpheus.orpheus_speak_async("Hello there")) == b"aabbcc"
+
+
+def test_blocking_speech_goes_through_shared_scheduler(orpheus):
+    try:
+        orpheus.scheduler.pause_bulk()
+        warming = orpheus.prerender(["one", "two"])
+        audio, timing = orpheus.synthesize("Hello there")
+        assert audio == b"aabbcc"
+        assert len(timing) == 2
+        assert not any(future.done() for future in warming)
+
+        orpheus.scheduler.resume_bulk()
+        for future in warming:
+            future.result(timeout=1)
+        assert ("aria", "one") in orpheus.clip_cache
+    finally:
+        orpheus.scheduler.close()